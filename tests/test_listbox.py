@@ -758,6 +758,33 @@ class ListBoxRenderTest(unittest.TestCase):
             (3, 4),
         )
 
+    def test_mouse_press_after_render(self):
+        lb = urwid.ListBox(urwid.SimpleFocusListWalker([urwid.Edit(str(n)) for n in range(8)]))
+        size = (3, 4)
+        lb.set_focus(6)
+        canvas = lb.render(size, focus=True)
+        self.assertEqual([b"4  ", b"5  ", b"6  ", b"7  "], canvas.text)
+
+        lb.mouse_event(size, "mouse press", 3, 0, 0, focus=True)
+        self.assertEqual(lb.focus_position, 6)
+        lb.mouse_event(size, "mouse press", 1, 0, 0, focus=True)
+        self.assertEqual(lb.focus_position, 4)
+        lb.mouse_event(size, "mouse press", 1, 0, 1, focus=True)
+        self.assertEqual(lb.focus_position, 5)
+        self.assertEqual([b"4  ", b"5  ", b"6  ", b"7  "], lb.render(size, focus=True).text)
+
+    def test_ends_visible(self):
+        lb = urwid.ListBox(urwid.SimpleFocusListWalker([urwid.Text(str(n)) for n in range(6)]))
+        size = (3, 4)
+        self.assertEqual(["top"], lb.ends_visible(size))
+        lb.set_focus(5)
+        canvas = lb.render(size)
+        self.assertEqual([b"2  ", b"3  ", b"4  ", b"5  "], canvas.text)
+        self.assertEqual(["bottom"], lb.ends_visible(size))
+        lb.body.extend([urwid.Text(str(n)) for n in range(6, 9)])
+        self.assertEqual([], lb.ends_visible(size))
+        self.assertEqual(["top", "bottom"], lb.ends_visible((3, 9)))
+
 
 class ListBoxKeypressTest(unittest.TestCase):
     def ktest(
@@ -1905,6 +1932,31 @@ class ListBoxKeypressTest(unittest.TestCase):
             None,
         )
 
+    def test_page_down_focus_rows_changed(self):
+        """Rows of the new focus are measured again after the cursor moved inside it."""
+
+        class FocusTallText(urwid.Text):
+            _selectable = True
+
+            def keypress(self, size, key):
+                return key
+
+            def rows(self, size, focus=False):
+                return 4 if focus else 1
+
+            def render(self, size, focus=False):
+                return urwid.Text("e\n\n\n" if focus else "e").render(size)
+
+        pile = urwid.Pile([FocusTallText(""), urwid.Edit("b1")])
+        lb = urwid.ListBox(urwid.SimpleFocusListWalker([urwid.Text("t0"), pile]))
+        lb.focus_position = 1
+        size = (6, 4)
+        lb.render(size, focus=True)
+        lb.keypress(size, "page down")
+        self.assertEqual(1, pile.focus_position)
+        self.assertEqual((1, 2), lb.inset_fraction)
+        self.assertEqual([b"t0    ", b"e     ", b"b1    ", b"      "], lb.render(size, focus=True).text)
+
 
 class ZeroHeightContentsTest(unittest.TestCase):
     def test_listbox_pile(self):
@@ -1970,6 +2022,31 @@ class ListBoxSetBodyTest(unittest.TestCase):
             "outdated canvas cache reuse after ListWalker's contents modified",
         )
 
+    def test_render_cache_restored(self):
+        class NoSignalWalker:
+            def __init__(self):
+                self.widget = urwid.Text("static")
+
+            def get_focus(self):
+                return self.widget, 0
+
+            def set_focus(self, position):
+                pass
+
+            def get_next(self, position):
+                return None, None
+
+            def get_prev(self, position):
+                return None, None
+
+        lb = urwid.ListBox(NoSignalWalker())
+        self.assertIn("render", vars(lb), "walker without modified signal must not use canvas cache")
+        self.assertEqual([b"static"], lb.render((6, 1)).text)
+
+        lb.body = urwid.SimpleListWalker([urwid.Text("cached")])
+        self.assertNotIn("render", vars(lb), "canvas cache not restored for walker with modified signal")
+        self.assertEqual([b"cached"], lb.render((6, 1)).text)
+
 
 class TestListWalkerFromIterable(unittest.TestCase):
     def test_01_simple_list_walker(self):
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import importlib.util
+import typing
 import unittest
 
 
@@ -17,3 +19,26 @@ class TestMovedImports(unittest.TestCase):
         from urwid.html_fragment import HtmlGenerator
 
         self.assertIs(html_fragment.HtmlGenerator, HtmlGenerator)
+
+
+@unittest.skipUnless(importlib.util.find_spec("trio"), "Trio not available")
+class TestLazyImports(unittest.TestCase):
+    def test_lazy_event_loop_dir(self) -> None:
+        import urwid
+        from urwid.event_loop.trio_loop import TrioEventLoop
+
+        self.assertIn("TrioEventLoop", dir(urwid))
+        self.assertIn("TrioEventLoop", dir(urwid.event_loop))
+        self.assertIs(TrioEventLoop, urwid.TrioEventLoop)
+
+    def test_lazy_event_loop_star_import(self) -> None:
+        from urwid.event_loop.trio_loop import TrioEventLoop
+
+        namespace: dict[str, typing.Any] = {}
+        exec("from urwid import *", namespace)  # pylint: disable=exec-used  # noqa: S102
+        self.assertIs(TrioEventLoop, namespace["TrioEventLoop"])
+        self.assertIn("Text", namespace)
+
+        namespace = {}
+        exec("from urwid.event_loop import *", namespace)  # pylint: disable=exec-used  # noqa: S102
+        self.assertIs(TrioEventLoop, namespace["TrioEventLoop"])
@@ -291,6 +291,45 @@ class TestScrollBarListBox(unittest.TestCase):
 
         self.assertEqual(top_position_rendered, widget.render(reduced_size).decoded_text)
 
+    def test_scrollpos_after_rows_max(self):
+        """Scroll position should not depend on rows_max called before."""
+        lbox = urwid.ListBox(urwid.SimpleListWalker(urwid.Text("\n" * (idx % 3)) for idx in range(50)))
+        size = (10, 5)
+        lbox.render(size)
+        for _ in range(30):
+            lbox.keypress(size, "down")
+        lbox.render(size)
+
+        expected = lbox.get_scrollpos(size)
+        lbox.rows_max(size)
+        self.assertEqual(expected, lbox.get_scrollpos(size))
+        self.assertEqual(
+            lbox.focus_position - len(lbox.calculate_visible(size).top.fill), lbox.get_first_visible_pos(size)
+        )
+
+    def test_scrollpos_after_rows_max_modified(self):
+        """Scroll position should follow rows changed above the visible part after rows_max."""
+        lbox = urwid.ListBox(urwid.SimpleListWalker(urwid.Text(str(idx)) for idx in range(30)))
+        size = (10, 5)
+        lbox.set_focus(20)
+        lbox.render(size)
+        lbox.rows_max(size)
+        self.assertEqual(18, lbox.get_scrollpos(size))
+
+        lbox.rows_max(size)
+        lbox.body[0].set_text("a\nb\nc")
+        self.assertEqual(20, lbox.get_scrollpos(size))
+
+    def test_visible_after_render(self):
+        """Visible part used by render should not be reused after the contents change."""
+        lbox = urwid.ListBox(urwid.SimpleListWalker(urwid.Text(str(idx)) for idx in range(50)))
+        size = (10, 5)
+        lbox.render(size)
+        self.assertEqual(5, lbox.get_visible_amount(size))
+
+        lbox.body[1].set_text("1\n1\n1")
+        self.assertEqual(3, lbox.get_visible_amount(size))
+
     def test_empty(self):
         """Empty widget should be correctly rendered."""
         widget = urwid.ScrollBar(urwid.ListBox(urwid.SimpleListWalker(())))
@@ -232,11 +232,6 @@ try:
 except ImportError:
     pass
 
-try:
-    from .event_loop import TrioEventLoop
-except ImportError:
-    pass
-
 # OS Specific
 if sys.platform != "win32":
     from .vterm import TermCanvas, TermCharset, Terminal, TermModes
@@ -319,12 +314,21 @@ for _name, _module in _moved_warn.items():
     sys.modules[_module_path] = _MovedModuleWarn(_module_path, _module)
 
 
+# Lazy load event loops with heavy import time dependencies: only available are exported
+_lazy_event_loops: frozenset[str] = frozenset(("TrioEventLoop",)).intersection(event_loop.__all__)
+
+
 def __getattr__(name: str) -> typing.Any:
     """Get attributes lazy.
 
     :return: attribute by name
     :raises AttributeError: attribute is not defined for lazy load
     """
+    if name in _lazy_event_loops:
+        evl = getattr(event_loop, name)
+        __locals[name] = evl
+        return evl
+
     if name in _moved_no_warn:
         mod = importlib.import_module(_moved_no_warn[name])
         __locals[name] = mod
@@ -341,3 +345,12 @@ def __getattr__(name: str) -> typing.Any:
         __locals[name] = mod
         return mod
     raise AttributeError(f"{name} not found in {__package__}")
+
+
+def __dir__() -> list[str]:
+    """Module attributes including not loaded yet lazy event loops."""
+    return sorted({*__locals, *_lazy_event_loops})
+
+
+# Without explicit `__all__` star import exports only already loaded globals
+__all__ = [name for name in __dir__() if not name.startswith("_")]
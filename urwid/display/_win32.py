@@ -162,7 +162,7 @@ SetConsoleMode.restype = BOOL
 
 # https://docs.microsoft.com/de-de/windows/console/readconsoleinput
 ReadConsoleInputW = windll.kernel32.ReadConsoleInputW
-# ReadConsoleInputW.argtypes = [HANDLE, POINTER(INPUT_RECORD), DWORD, LPDWORD]
+ReadConsoleInputW.argtypes = [HANDLE, POINTER(INPUT_RECORD), DWORD, LPDWORD]
 ReadConsoleInputW.restype = BOOL
 
 # https://docs.microsoft.com/en-us/windows/console/getconsolescreenbufferinfo
@@ -24,15 +24,17 @@ Direct terminal UI implementation
 
 from __future__ import annotations
 
+import array
 import contextlib
-import functools
+import itertools
 import logging
+import operator
 import selectors
 import socket
 import sys
 import threading
 import typing
-from ctypes import byref
+from ctypes import byref, sizeof
 from ctypes.wintypes import DWORD
 
 from urwid import signals
@@ -45,6 +47,10 @@ if typing.TYPE_CHECKING:
 
     from urwid.event_loop import EventLoop
 
+# Console modes enabled on top of the original ones while the screen is started
+OUTPUT_CONSOLE_MODE = _win32.ENABLE_VIRTUAL_TERMINAL_PROCESSING | _win32.DISABLE_NEWLINE_AUTO_RETURN
+INPUT_CONSOLE_MODE = _win32.ENABLE_WINDOW_INPUT | _win32.ENABLE_VIRTUAL_TERMINAL_INPUT
+
 
 class Screen(_raw_display_base.Screen):
     _term_input_file: socket.socket
@@ -58,12 +64,30 @@ class Screen(_raw_display_base.Screen):
         terminal.
         """
         if input is None:
+            # Pipes can not be watched by select() on Windows: keep sockets,
+            # but socketpair is emulated by loopback TCP connection here.
+            # Disable Nagle algorithm to deliver every input batch immediately.
             input, self._send_input = socket.socketpair()  # noqa: A001
+            if self._send_input.family in {socket.AF_INET, socket.AF_INET6}:
+                self._send_input.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
 
         super().__init__(input, output)
 
-    _dwOriginalOutMode = None
-    _dwOriginalInMode = None
+        # standard handles are stable for the process lifetime
+        self._handle_out = _win32.GetStdHandle(_win32.STD_OUTPUT_HANDLE)
+        self._handle_in = _win32.GetStdHandle(_win32.STD_INPUT_HANDLE)
+
+        # ctypes buffers reused by console API calls
+        self._dwOriginalOutMode = DWORD()
+        self._dwOriginalInMode = DWORD()
+        self._screen_buffer_info = _win32.CONSOLE_SCREEN_BUFFER_INFO()
+        # receive buffer for input socket
+        self._input_buffer = bytearray(4096)
+        self._input_buffer_view = memoryview(self._input_buffer)
+
+        # output is not changed after initialization: check it once
+        self._query_console_size = hasattr(output, "fileno")
+        self._unexpected_output = self._query_console_size and output != sys.stdout
 
     def _start(self, alternate_buffer: bool = True) -> None:
         """
@@ -77,22 +101,14 @@ class Screen(_raw_display_base.Screen):
         else:
             self._rows_used = 0
 
-        handle_out = _win32.GetStdHandle(_win32.STD_OUTPUT_HANDLE)
-        handle_in = _win32.GetStdHandle(_win32.STD_INPUT_HANDLE)
-        self._dwOriginalOutMode = DWORD()
-        self._dwOriginalInMode = DWORD()
+        handle_out = self._handle_out
+        handle_in = self._handle_in
         _win32.GetConsoleMode(handle_out, byref(self._dwOriginalOutMode))
         _win32.GetConsoleMode(handle_in, byref(self._dwOriginalInMode))
         # TODO: Restore on exit
 
-        dword_out_mode = DWORD(
-            self._dwOriginalOutMode.value
-            | _win32.ENABLE_VIRTUAL_TERMINAL_PROCESSING
-            | _win32.DISABLE_NEWLINE_AUTO_RETURN
-        )
-        dword_in_mode = DWORD(
-            self._dwOriginalInMode.value | _win32.ENABLE_WINDOW_INPUT | _win32.ENABLE_VIRTUAL_TERMINAL_INPUT
-        )
+        dword_out_mode = DWORD(self._dwOriginalOutMode.value | OUTPUT_CONSOLE_MODE)
+        dword_in_mode = DWORD(self._dwOriginalInMode.value | INPUT_CONSOLE_MODE)
 
         if not (ok := _win32.SetConsoleMode(handle_out, dword_out_mode)):
             raise RuntimeError(f"ConsoleMode set failed for output. Err: {ok!r}")
@@ -101,6 +117,7 @@ class Screen(_raw_display_base.Screen):
             raise RuntimeError(f"ConsoleMode set failed for input. Err: {ok!r}")
         self._alternate_buffer = alternate_buffer
         self._next_timeout = self.max_wait
+        self._input_descriptors = tuple(fd for fd in (self._resize_pipe_rd, self._term_input_io) if fd is not None)
 
         signals.emit_signal(self, INPUT_DESCRIPTORS_CHANGED)
         # restore mouse tracking to previous state
@@ -114,12 +131,15 @@ class Screen(_raw_display_base.Screen):
         """
         self.clear()
 
+        self._input_descriptors = ()
         signals.emit_signal(self, INPUT_DESCRIPTORS_CHANGED)
 
         self._stop_mouse_restore_buffer()
 
-        handle_out = _win32.GetStdHandle(_win32.STD_OUTPUT_HANDLE)
-        handle_in = _win32.GetStdHandle(_win32.STD_INPUT_HANDLE)
+        self._stop_input_thread()
+
+        handle_out = self._handle_out
+        handle_in = self._handle_in
 
         if not (ok := _win32.SetConsoleMode(handle_out, self._dwOriginalOutMode)):
             raise RuntimeError(f"ConsoleMode set failed for output. Err: {ok!r}")
@@ -129,17 +149,29 @@ class Screen(_raw_display_base.Screen):
 
         super()._stop()
 
-    def unhook_event_loop(self, event_loop: EventLoop) -> None:
+    _input_descriptors: tuple[socket.socket, ...] = ()
+
+    def get_input_descriptors(self) -> list[socket.socket | typing.IO | int]:
         """
-        Remove any hooks added by hook_event_loop.
+        Return a list of integer file descriptors that should be
+        polled in external event loops to check for user input.
+
+        Use this method if you are implementing your own event loop.
+
+        This method is only called by `hook_event_loop`, so if you override
+        that, you can safely ignore this.
         """
-        if self._input_thread is not None:
-            self._input_thread.should_exit = True
+        if not self._started:
+            return []
 
-            with contextlib.suppress(RuntimeError):
-                self._input_thread.join(5)
+        return list(self._input_descriptors)
 
-            self._input_thread = None
+    def unhook_event_loop(self, event_loop: EventLoop) -> None:
+        """
+        Remove any hooks added by hook_event_loop.
+        """
+        if not self._started:
+            self._stop_input_thread()
 
         for handle in self._current_event_loop_handles:
             event_loop.remove_watch_file(handle)
@@ -160,15 +192,21 @@ class Screen(_raw_display_base.Screen):
 
         Subclasses may wish to use parse_input to wrap the callback.
         """
-        self._input_thread = ReadInputThread(self._send_input, lambda: self._sigwinch_handler(28))
-        self._input_thread.start()
+        if self._input_thread is None:
+            # Console input reading does not depend on the event loop:
+            # keep the thread across re-hooking (input descriptors change) until the screen stops.
+            self._input_thread = ReadInputThread(
+                self._send_input,
+                lambda: self._sigwinch_handler(28),
+                self._handle_in,
+            )
+            self._input_thread.start()
         if hasattr(self, "get_input_nonblocking"):
             wrapper = self._make_legacy_input_wrapper(event_loop, callback)
         else:
-
-            @functools.wraps(callback)
-            def wrapper() -> tuple[list[str], typing.Any] | None:
-                return self.parse_input(event_loop, callback, self.get_available_raw_input())
+            self._event_loop = event_loop
+            self._event_loop_callback = callback
+            wrapper = self._event_loop_wrapper
 
         fds = self.get_input_descriptors()
         handles = [event_loop.watch_file(fd if isinstance(fd, int) else fd.fileno(), wrapper) for fd in fds]
@@ -176,6 +214,27 @@ class Screen(_raw_display_base.Screen):
 
     _input_thread: ReadInputThread | None = None
 
+    def _stop_input_thread(self) -> None:
+        if self._input_thread is not None:
+            self._input_thread.should_exit = True
+
+            with contextlib.suppress(RuntimeError):
+                self._input_thread.join(5)
+
+            self._input_thread = None
+
+    _event_loop: EventLoop | None = None
+    _event_loop_callback: Callable[[list[str], list[int]], typing.Any] | None = None
+
+    def _event_loop_wrapper(self) -> None:
+        """Event loop watch callback: parse available input and pass it to the hooked callback."""
+        codes = self.get_available_raw_input()
+        if not codes and not self._resized:
+            # Spurious wakeup: nothing to report.
+            # Incomplete input is not lost: pending partial codes are included in `codes`.
+            return None
+        return self.parse_input(self._event_loop, self._event_loop_callback, codes)
+
     def _read_raw_input(self, timeout: int) -> bytearray:
         ready = self._wait_for_input_ready(timeout)
 
@@ -189,7 +248,10 @@ class Screen(_raw_display_base.Screen):
             selector.register(fd, selectors.EVENT_READ)
 
             while selector.select(0):
-                chars.extend(self._term_input_file.recv(1024))
+                received = self._term_input_file.recv_into(self._input_buffer)
+                if not received:  # input socket is closed
+                    break
+                chars += self._input_buffer_view[:received]
 
             return chars
 
@@ -197,13 +259,12 @@ class Screen(_raw_display_base.Screen):
         """Return the terminal dimensions (num columns, num rows)."""
         y, x = super().get_cols_rows()
         with contextlib.suppress(OSError):  # Term size could not be determined
-            if hasattr(self._term_output_file, "fileno"):
-                if self._term_output_file != sys.stdout:
+            if self._query_console_size:
+                if self._unexpected_output:
                     raise RuntimeError("Unexpected terminal output file")
-                handle = _win32.GetStdHandle(_win32.STD_OUTPUT_HANDLE)
-                info = _win32.CONSOLE_SCREEN_BUFFER_INFO()
+                info = self._screen_buffer_info
 
-                if _win32.GetConsoleScreenBufferInfo(handle, byref(info)):
+                if _win32.GetConsoleScreenBufferInfo(self._handle_out, byref(info)):
                     # Fallback will be used in case of term size could not be determined
                     y, x = info.dwSize.Y, info.dwSize.X
 
@@ -211,6 +272,12 @@ class Screen(_raw_display_base.Screen):
         return x, y
 
 
+KEY_EVENT = _win32.EventType.KEY_EVENT
+WINDOW_BUFFER_SIZE_EVENT = _win32.EventType.WINDOW_BUFFER_SIZE_EVENT
+# TODO: handle mouse events
+HANDLED_EVENTS = frozenset((KEY_EVENT, WINDOW_BUFFER_SIZE_EVENT))
+
+
 class ReadInputThread(threading.Thread):
     name = "urwid Windows input reader"
     daemon = True
@@ -220,41 +287,73 @@ class ReadInputThread(threading.Thread):
         self,
         input_socket: socket.socket,
         resize: Callable[[], typing.Any],
+        handle_in: int,
     ) -> None:
         self._input = input_socket
         self._resize = resize
+        self._handle_in = handle_in
         self.logger = logging.getLogger(__name__).getChild(self.__class__.__name__)
         super().__init__()
 
     def run(self) -> None:
-        hIn = _win32.GetStdHandle(_win32.STD_INPUT_HANDLE)
+        hIn = self._handle_in
         MAX = 2048
 
         read = DWORD(0)
+        read_ref = byref(read)
         arrtype = _win32.INPUT_RECORD * MAX
         input_records = arrtype()
+        # raw bytes of the records buffer for bulk parsing
+        records_data = memoryview(input_records).cast("B")
+        # strided views of single WORDs of the records:
+        # EventType, low WORD of bKeyDown and uChar of the KEY_EVENT_RECORD
+        words_data = records_data.cast("H")
+        record_words = sizeof(_win32.INPUT_RECORD) // 2
+        event_types_data = words_data[::record_words]
+        key_down_data = words_data[2::record_words]
+        chars_data = words_data[7::record_words]
+        # UTF-16 code units of key input
+        input_chars = array.array("H")
 
         while True:
-            _win32.ReadConsoleInputW(hIn, byref(input_records), MAX, byref(read))
+            # array of INPUT_RECORD is accepted as a pointer to the first record by argtypes
+            _win32.ReadConsoleInputW(hIn, input_records, MAX, read_ref)
             if self.should_exit:
                 return
-            for i in range(read.value):
-                inp = input_records[i]
-                if inp.EventType == _win32.EventType.KEY_EVENT:
-                    if not inp.Event.KeyEvent.bKeyDown:
-                        continue
-
-                    input_data = inp.Event.KeyEvent.uChar.UnicodeChar
-                    # On Windows atomic press/release of modifier keys produce phantom input with code NULL.
-                    # This input cannot be decoded and should be handled as garbage.
-                    input_bytes = input_data.encode("utf-8")
-                    if input_bytes != b"\x00":
-                        self._input.send(input_bytes)
-
-                elif inp.EventType == _win32.EventType.WINDOW_BUFFER_SIZE_EVENT:
-                    self._resize()
-                else:
-                    pass  # TODO: handle mouse events
+            # skip not handled events (mouse move floods) before dispatching them in python
+            event_types = event_types_data[: read.value].tolist()
+            if not HANDLED_EVENTS.intersection(event_types):
+                continue
+
+            # Select pressed keys with C-level iterators instead of python bytecode per record:
+            # paste/key repeat deliver large batches.
+            # NULL input (phantom press/release of modifier keys) is dropped by filter.
+            is_key_press = map(
+                operator.and_,
+                map(KEY_EVENT.__eq__, event_types),
+                key_down_data[: read.value].tolist(),
+            )
+            input_chars.extend(filter(None, itertools.compress(chars_data[: read.value].tolist(), is_key_press)))
+            self._send_input_chars(input_chars)
+
+            # Resizing console window produces a flood of events: notify once per batch
+            if WINDOW_BUFFER_SIZE_EVENT in event_types:
+                self._resize()
+
+    def _send_input_chars(self, chars: array.array) -> None:
+        """Send collected UTF-16 code units as UTF-8 and remove them from *chars*.
+
+        Characters outside the BMP arrive as surrogate pairs in separate records,
+        so a trailing high surrogate is kept until the rest of the pair is read.
+        """
+        complete = len(chars)
+        if complete and 0xD800 <= chars[-1] < 0xDC00:
+            complete -= 1
+        if not complete:
+            return
+
+        self._input.sendall(chars[:complete].tobytes().decode("utf-16-le", "replace").encode("utf-8"))
+        del chars[:complete]
 
 
 def _test():
@@ -2,7 +2,10 @@
 
 from __future__ import annotations
 
+import importlib
+import importlib.util
 import sys
+import typing
 
 from .abstract_loop import EventLoop, ExitMainLoop
 from .asyncio_loop import AsyncioEventLoop
@@ -38,12 +41,13 @@ try:
 except ImportError:
     pass
 
-try:
-    from .trio_loop import TrioEventLoop
+# Lazy load event loops with heavy import time dependencies
+_lazy_load: dict[str, str] = {
+    "TrioEventLoop": "trio_loop",
+}
 
+if importlib.util.find_spec("trio") is not None:
     __all__ += ("TrioEventLoop",)  # type: ignore[assignment]
-except ImportError:
-    pass
 
 if sys.platform != "win32":
     # ZMQEventLoop cause interpreter crash on windows
@@ -53,3 +57,27 @@ if sys.platform != "win32":
         __all__ += ("ZMQEventLoop",)  # type: ignore[assignment]
     except ImportError:
         pass
+
+
+def __getattr__(name: str) -> typing.Any:
+    """Get attributes lazy.
+
+    :return: attribute by name
+    :raises AttributeError: attribute is not defined for lazy load or dependency is not available
+    """
+    if name in _lazy_load:
+        try:
+            mod = importlib.import_module(f"{__package__}.{_lazy_load[name]}")
+        except ImportError as exc:
+            raise AttributeError(f"{name} is not available in {__package__}: {exc}") from exc
+
+        value = getattr(mod, name)
+        globals()[name] = value
+        return value
+
+    raise AttributeError(f"{name} not found in {__package__}")
+
+
+def __dir__() -> list[str]:
+    """Module attributes including not loaded yet lazy event loops."""
+    return sorted({*globals(), *__all__})
@@ -20,6 +20,7 @@
 
 from __future__ import annotations
 
+import functools
 import operator
 import typing
 import warnings
@@ -27,7 +28,8 @@ from collections.abc import Iterable, Sized
 from contextlib import suppress
 
 from urwid import signals
-from urwid.canvas import CanvasCombine, SolidCanvas
+from urwid.canvas import CanvasCache, CanvasCombine, SolidCanvas
+from urwid.command_map import Command
 
 from .constants import Sizing, VAlign, WHSettings, normalize_valign
 from .container import WidgetContainerMixin
@@ -36,7 +38,8 @@ from .monitored_list import MonitoredFocusList, MonitoredList
 from .widget import Widget, nocache_widget_render_instance
 
 if typing.TYPE_CHECKING:
-    from collections.abc import Callable, Hashable
+    from collections.abc import Callable, Hashable, Iterator
+    from types import TracebackType
 
     from typing_extensions import Literal, Self
 
@@ -344,6 +347,65 @@ class VisibleInfo(typing.NamedTuple):
         )
 
 
+class _RowsCache:
+    """Memoize rows of the child widgets while the ListBox operation is running.
+
+    Rows of widgets can change during one operation only if the ListBox moves the cursor inside them
+    (the focus of a container may change), so :meth:`ListBox.change_focus` discards rows of the target widget.
+    Between operations rows are cached by :class:`CanvasCache` with proper invalidation.
+    """
+
+    __slots__ = ("_listbox", "_rows")
+
+    def __init__(self, listbox: ListBox) -> None:
+        self._listbox = listbox
+        # (id, maxcol, focus) -> (widget, rows)
+        # keep reference to the widget: id can not be reused by the new (lazy loaded) widget
+        self._rows: dict[tuple[int, int, bool], tuple[Widget, int]] = {}
+
+    def __enter__(self) -> None:
+        if self._listbox._rows_cache is None:  # not a nested call: activate
+            self._listbox._rows_cache = self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: TracebackType | None,
+    ) -> None:
+        if self._listbox._rows_cache is self:
+            self._listbox._rows_cache = None
+
+    def rows(self, widget: Widget, maxcol: int, focus: bool) -> int:
+        key = (id(widget), maxcol, focus)
+        if (cached := self._rows.get(key)) is not None:
+            return cached[1]
+
+        rows = widget.rows((maxcol,), focus)
+        self._rows[key] = (widget, rows)
+        return rows
+
+    def discard(self, widget: Widget) -> None:
+        """Forget rows of the *widget* after it was modified."""
+        widget_id = id(widget)
+        for key in [key for key in self._rows if key[0] == widget_id]:
+            del self._rows[key]
+
+
+def _with_rows_cache(method: Callable[..., _T]) -> Callable[..., _T]:
+    """Memoize rows of the child widgets while the ListBox *method* is running.
+
+    Nested calls use the cache of the outer call.
+    """
+
+    @functools.wraps(method)
+    def wrapper(self: ListBox, *args, **kwargs) -> _T:
+        with _RowsCache(self):
+            return method(self, *args, **kwargs)
+
+    return wrapper
+
+
 class ListBox(Widget, WidgetContainerMixin):
     """
     Vertically stacked list of widgets
@@ -387,6 +449,28 @@ class ListBox(Widget, WidgetContainerMixin):
         # used for scrollable protocol
         self._rows_max_cached = 0
         self._rendered_size = 0, 0
+        # calculate_visible result used by the last render: (state key, result)
+        self._visible_cached: tuple[tuple[typing.Any, ...], VisibleInfo | tuple[None, None, None]] | None = None
+
+    # keypress handlers for commands not handled by the focus widget
+    _command_handlers: typing.ClassVar[dict[Command, str]] = {
+        Command.UP: "_keypress_up",
+        Command.DOWN: "_keypress_down",
+        Command.PAGE_UP: "_keypress_page_up",
+        Command.PAGE_DOWN: "_keypress_page_down",
+        Command.MAX_LEFT: "_keypress_max_left",
+        Command.MAX_RIGHT: "_keypress_max_right",
+    }
+
+    # widget rows memoized by _with_rows_cache
+    _rows_cache: _RowsCache | None = None
+
+    def _rows(self, widget: Widget, maxcol: int, focus: bool = False) -> int:
+        """Return ``widget.rows((maxcol,), focus)`` memoized if rows cache is active."""
+        if (cache := self._rows_cache) is None:
+            return widget.rows((maxcol,), focus)
+
+        return cache.rows(widget, maxcol, focus)
 
     @property
     def body(self) -> ListWalker:
@@ -406,6 +490,16 @@ class ListBox(Widget, WidgetContainerMixin):
             self._body = body
         else:
             self._body = SimpleListWalker(body)
+
+        from .treetools import TreeWalker  # circular import
+
+        # runtime checkable protocols check is slow: do it once per body
+        self._body_scroll_supported = isinstance(self._body, ScrollSupportingBody)
+        self._body_sized = isinstance(self._body, Sized)
+        self._body_length_hinted = self._body_sized or isinstance(self._body, EstimatedSized)
+        # TreeWalker is limited by the tree root, scroll position calculation is finite
+        self._body_limited = self._body_length_hinted or isinstance(self._body, TreeWalker)
+
         try:
             signals.connect_signal(self._body, "modified", self._invalidate)
         except NameError:
@@ -413,17 +507,22 @@ class ListBox(Widget, WidgetContainerMixin):
             # cache our canvases because we don't know when our
             # content has changed
             self.render = nocache_widget_render_instance(self)
+        else:
+            # previous body may have had no modified signal: restore canvas caching
+            vars(self).pop("render", None)
         self._invalidate()
 
     @property
     def __len__(self) -> Callable[[], int]:
-        if isinstance(self._body, Sized):
+        if self._body_sized:
             return self._body.__len__
         raise AttributeError(f"{self._body.__class__.__name__} is not Sized")
 
     @property
-    def __length_hint__(self) -> Callable[[], int]:  # pylint: disable=invalid-length-hint-returned
-        if isinstance(self._body, (Sized, EstimatedSized)):
+    def __length_hint__(self) -> Callable[[], int]:
+        if self._body_sized:
+            return self._body.__len__
+        if self._body_length_hinted:
             return lambda: operator.length_hint(self._body)
         raise AttributeError(f'{self._body.__class__.__name__} is not Sized and do not implement "__length_hint__"')
 
@@ -457,6 +556,11 @@ class ListBox(Widget, WidgetContainerMixin):
         if self.set_focus_pending or self.set_focus_valign_pending:
             self._set_focus_complete((maxcol, maxrow), focus)
 
+        # methods used in the loops below
+        get_prev = self._body.get_prev
+        get_next = self._body.get_next
+        get_rows = self._rows
+
         # 1. start with the focus widget
         focus_widget, focus_pos = self._body.get_focus()
         if focus_widget is None:  # list box is empty?
@@ -470,8 +574,13 @@ class ListBox(Widget, WidgetContainerMixin):
 
         #    adjust position so cursor remains visible
         cursor = None
-        if maxrow and focus_widget.selectable() and focus and hasattr(focus_widget, "get_cursor_coords"):
-            cursor = focus_widget.get_cursor_coords((maxcol,))
+        if (
+            maxrow
+            and focus
+            and focus_widget.selectable()
+            and (get_cursor_coords := getattr(focus_widget, "get_cursor_coords", None))
+        ):
+            cursor = get_cursor_coords((maxcol,))
 
         if cursor is not None:
             _cx, cy = cursor
@@ -486,7 +595,7 @@ class ListBox(Widget, WidgetContainerMixin):
 
         #    set trim_top by focus trimmimg
         trim_top = inset_rows
-        focus_rows = focus_widget.rows((maxcol,), True)
+        focus_rows = self._rows(focus_widget, maxcol, True)
 
         # 2. collect the widgets above the focus
         pos = focus_pos
@@ -494,13 +603,13 @@ class ListBox(Widget, WidgetContainerMixin):
         fill_above = []
         top_pos = pos
         while fill_lines > 0:
-            prev, pos = self._body.get_prev(pos)
+            prev, pos = get_prev(pos)
             if prev is None:  # run out of widgets above?
                 offset_rows -= fill_lines
                 break
             top_pos = pos
 
-            p_rows = prev.rows((maxcol,))
+            p_rows = get_rows(prev, maxcol)
             if p_rows:  # filter out 0-height widgets
                 fill_above.append(VisibleInfoFillItem(prev, pos, p_rows))
             if p_rows > fill_lines:  # crosses top edge?
@@ -515,11 +624,11 @@ class ListBox(Widget, WidgetContainerMixin):
         fill_lines = maxrow - focus_rows - offset_rows + inset_rows
         fill_below = []
         while fill_lines > 0:
-            next_pos, pos = self._body.get_next(pos)
+            next_pos, pos = get_next(pos)
             if next_pos is None:  # run out of widgets below?
                 break
 
-            n_rows = next_pos.rows((maxcol,))
+            n_rows = get_rows(next_pos, maxcol)
             if n_rows:  # filter out 0-height widgets
                 fill_below.append(VisibleInfoFillItem(next_pos, pos, n_rows))
             if n_rows > fill_lines:  # crosses bottom edge?
@@ -542,11 +651,11 @@ class ListBox(Widget, WidgetContainerMixin):
                 trim_top = 0
         pos = top_pos
         while fill_lines > 0:
-            prev, pos = self._body.get_prev(pos)
+            prev, pos = get_prev(pos)
             if prev is None:
                 break
 
-            p_rows = prev.rows((maxcol,))
+            p_rows = get_rows(prev, maxcol)
             fill_above.append(VisibleInfoFillItem(prev, pos, p_rows))
             if p_rows > fill_lines:  # more than required
                 trim_top = p_rows - fill_lines
@@ -562,13 +671,42 @@ class ListBox(Widget, WidgetContainerMixin):
             VisibleInfoTopBottom(trim_bottom, fill_below),
         )
 
-    def _check_support_scrolling(self) -> None:
-        from .treetools import TreeWalker
+    def _visible_state(self, size: tuple[int, int], focus: bool) -> tuple[typing.Any, ...]:
+        """Key for the calculate_visible result: size, focus and everything in ListBox defining the view."""
+        return (
+            size,
+            focus,
+            self._body,
+            self._body.get_focus()[1],
+            self.offset_rows,
+            self.inset_fraction,
+            self.set_focus_pending,
+            self.set_focus_valign_pending,
+        )
+
+    def _calculate_visible_rendered(
+        self,
+        size: tuple[int, int],
+        focus: bool = False,
+    ) -> VisibleInfo | tuple[None, None, None]:
+        """Return calculate_visible result used by the last render if it is still valid.
+
+        Canvas of the ListBox is removed from the :class:`CanvasCache` when ListBox or any rendered widget changed,
+        so the cached canvas is a proof of not changed visible part.
+        Result is shared: callers should not modify it.
+        """
+        if (cached := self._visible_cached) is not None and cached[0] == self._visible_state(size, focus):
+            render_cls = next(cls for cls in type(self).__mro__ if "render" in vars(cls))
+            if CanvasCache.fetch(self, render_cls, size, focus) is not None:
+                return cached[1]
 
-        if not isinstance(self._body, ScrollSupportingBody):
+        return self.calculate_visible(size, focus)
+
+    def _check_support_scrolling(self) -> None:
+        if not self._body_scroll_supported:
             raise ListBoxError(f"{self} body do not implement methods required for scrolling protocol")
 
-        if not isinstance(self._body, (Sized, EstimatedSized, TreeWalker)):
+        if not self._body_limited:
             raise ListBoxError(
                 f"{self} body is not a Sized, can not estimate it's size and not a TreeWalker."
                 f"Scroll is not allowed due to risk of infinite cycle of widgets load."
@@ -577,6 +715,7 @@ class ListBox(Widget, WidgetContainerMixin):
         if getattr(self._body, "wrap_around", False):
             raise ListBoxError("Body is wrapped around. Scroll position calculation is undefined.")
 
+    @_with_rows_cache
     def get_scrollpos(self, size: tuple[int, int] | None = None, focus: bool = False) -> int:
         """Current scrolling position."""
         self._check_support_scrolling()
@@ -587,7 +726,7 @@ class ListBox(Widget, WidgetContainerMixin):
         if size is not None:
             self._rendered_size = size
 
-        mid, top, _bottom = self.calculate_visible(self._rendered_size, focus)
+        mid, top, _bottom = self._calculate_visible_rendered(self._rendered_size, focus)
 
         start_row = top.trim
         maxcol = self._rendered_size[0]
@@ -599,11 +738,12 @@ class ListBox(Widget, WidgetContainerMixin):
 
         prev, pos = self._body.get_prev(pos)
         while prev is not None:
-            start_row += prev.rows((maxcol,))
+            start_row += self._rows(prev, maxcol)
             prev, pos = self._body.get_prev(pos)
 
         return start_row
 
+    @_with_rows_cache
     def rows_max(self, size: tuple[int, int] | None = None, focus: bool = False) -> int:
         """Scrollable protocol for sized iterable and not wrapped around contents."""
         self._check_support_scrolling()
@@ -617,16 +757,16 @@ class ListBox(Widget, WidgetContainerMixin):
 
             focused_w, idx = self.body.get_focus()
             if focused_w:
-                rows += focused_w.rows((cols,), focus)
+                rows += self._rows(focused_w, cols, focus)
 
                 prev, pos = self._body.get_prev(idx)
                 while prev is not None:
-                    rows += prev.rows((cols,), False)
+                    rows += self._rows(prev, cols, False)
                     prev, pos = self._body.get_prev(pos)
 
                 next_, pos = self.body.get_next(idx)
                 while next_ is not None:
-                    rows += next_.rows((cols,), True)
+                    rows += self._rows(next_, cols, True)
                     next_, pos = self._body.get_next(pos)
 
             self._rows_max_cached = rows
@@ -635,20 +775,25 @@ class ListBox(Widget, WidgetContainerMixin):
 
     def require_relative_scroll(self, size: tuple[int, int], focus: bool = False) -> bool:
         """Widget require relative scroll due to performance limitations of real lines count calculation."""
-        return isinstance(self._body, (Sized, EstimatedSized)) and (size[1] * 3 < operator.length_hint(self.body))
+        return self._body_length_hinted and (size[1] * 3 < operator.length_hint(self.body))
 
+    @_with_rows_cache
     def get_first_visible_pos(self, size: tuple[int, int], focus: bool = False) -> int:
         self._check_support_scrolling()
 
         if not self._body:
             return 0
 
-        _mid, top, _bottom = self.calculate_visible(size, focus)
+        _mid, top, _bottom = self._calculate_visible_rendered(size, focus)
         if top.fill:
             first_pos = top.fill[-1].position
         else:
             first_pos = self.focus_position
 
+        if isinstance(self._body, (SimpleListWalker, SimpleFocusListWalker)):
+            # positions are indexes
+            return first_pos
+
         over = 0
         _widget, first_pos = self.body.get_prev(first_pos)
         while first_pos is not None:
@@ -663,9 +808,10 @@ class ListBox(Widget, WidgetContainerMixin):
         if not self._body:
             return 1
 
-        _mid, top, bottom = self.calculate_visible(size, focus)
+        _mid, top, bottom = self._calculate_visible_rendered(size, focus)
         return 1 + len(top.fill) + len(bottom.fill)
 
+    @_with_rows_cache
     def render(
         self,
         size: tuple[int, int],  # type: ignore[override]
@@ -680,7 +826,10 @@ class ListBox(Widget, WidgetContainerMixin):
 
         self._rendered_size = size
 
-        middle, top, bottom = self.calculate_visible((maxcol, maxrow), focus=focus)
+        visible = self.calculate_visible((maxcol, maxrow), focus=focus)
+        self._visible_cached = (self._visible_state(size, focus), visible)
+
+        middle, top, bottom = visible
         if middle is None:
             return SolidCanvas(" ", maxcol, maxrow)
 
@@ -688,11 +837,11 @@ class ListBox(Widget, WidgetContainerMixin):
         trim_top, fill_above = top  # pylint: disable=unpacking-non-sequence
         trim_bottom, fill_below = bottom  # pylint: disable=unpacking-non-sequence
 
+        w_size = (maxcol,)
         combinelist: list[tuple[Canvas, int, bool]] = []
         rows = 0
-        fill_above.reverse()  # fill_above is in bottom-up order
-        for widget, w_pos, w_rows in fill_above:
-            canvas = widget.render((maxcol,))
+        for widget, w_pos, w_rows in reversed(fill_above):  # fill_above is in bottom-up order
+            canvas = widget.render(w_size)
             if w_rows != canvas.rows():
                 raise ListBoxError(
                     f"Widget {widget!r} at position {w_pos!r} "
@@ -702,7 +851,7 @@ class ListBox(Widget, WidgetContainerMixin):
             rows += w_rows
             combinelist.append((canvas, w_pos, False))
 
-        focus_canvas = focus_widget.render((maxcol,), focus=focus)
+        focus_canvas = focus_widget.render(w_size, focus=focus)
 
         if focus_canvas.rows() != focus_rows:
             raise ListBoxError(
@@ -722,7 +871,7 @@ class ListBox(Widget, WidgetContainerMixin):
         combinelist.append((focus_canvas, focus_pos, True))
 
         for widget, w_pos, w_rows in fill_below:
-            canvas = widget.render((maxcol,))
+            canvas = widget.render(w_size)
             if w_rows != canvas.rows():
                 raise ListBoxError(
                     f"Widget {widget!r} at position {w_pos!r} "
@@ -758,16 +907,11 @@ class ListBox(Widget, WidgetContainerMixin):
             if fill_below:
                 bottom_pos = fill_below[-1][1]
 
-            rendered_positions = frozenset(idx for _, idx, _ in combinelist)
+            # usually checked once for the single next widget: hashing is not required
+            rendered_positions = tuple(idx for _, idx, _ in combinelist)
             widget, next_pos = self._body.get_next(bottom_pos)
-            while all(
-                (
-                    widget is not None,
-                    next_pos is not None,
-                    next_pos not in rendered_positions,
-                )
-            ):
-                if widget.rows((maxcol,), False):
+            while widget is not None and next_pos is not None and next_pos not in rendered_positions:
+                if self._rows(widget, maxcol, False):
                     raise ListBoxError(
                         f"Listbox contents too short!\n"
                         f"Render top={top!r}, middle={middle!r}, bottom={bottom!r}\n"
@@ -792,11 +936,11 @@ class ListBox(Widget, WidgetContainerMixin):
         """
         (maxcol, maxrow) = size
 
-        middle, _top, _bottom = self.calculate_visible((maxcol, maxrow), True)
+        middle, _top, _bottom = self._calculate_visible_rendered((maxcol, maxrow), True)
         if middle is None:
             return None
 
-        offset_inset, _ignore1, _ignore2, _ignore3, cursor = middle  # pylint: disable=unpacking-non-sequence
+        offset_inset, _ignore1, _ignore2, _ignore3, cursor = middle
         if not cursor:
             return None
 
@@ -888,7 +1032,9 @@ class ListBox(Widget, WidgetContainerMixin):
 
             __getitem__ = self._contents__getitem__
 
-            __len__ = self.__len__
+            def __len__(inner_self) -> int:
+                # body may be replaced after contents object creation
+                return len(self)
 
             def __repr__(inner_self) -> str:
                 return f"<{inner_self.__class__.__name__} for {self!r} at 0x{id(inner_self):X}>"
@@ -921,7 +1067,7 @@ class ListBox(Widget, WidgetContainerMixin):
         finally:
             self._body.set_focus(old_focus)
 
-    @property
+    @functools.cached_property
     def contents(self):
         """
         An object that allows reading widgets from the ListBox's list
@@ -955,7 +1101,7 @@ class ListBox(Widget, WidgetContainerMixin):
         if focus_widget is None:
             return
 
-        rows = focus_widget.rows((maxcol,), focus)
+        rows = self._rows(focus_widget, maxcol, focus)
         rtop, _rbot = calculate_top_bottom_filler(
             maxrow,
             vt,
@@ -995,6 +1141,7 @@ class ListBox(Widget, WidgetContainerMixin):
                 return
             new_row_offset += rows
 
+    @_with_rows_cache
     def _set_focus_complete(self, size: tuple[int, int], focus: bool) -> None:
         """Finish setting the position now that we have maxcol & maxrow."""
         (maxcol, maxrow) = size
@@ -1037,7 +1184,7 @@ class ListBox(Widget, WidgetContainerMixin):
         # failed to find widget among visible widgets
         self._body.set_focus(position)
         widget, position = self._body.get_focus()
-        rows = widget.rows((maxcol,), focus)
+        rows = self._rows(widget, maxcol, focus)
 
         if coming_from == "below":
             offset = 0
@@ -1073,7 +1220,7 @@ class ListBox(Widget, WidgetContainerMixin):
             self.inset_fraction = (0, 1)
         else:
             target, _ignore = self._body.get_focus()
-            tgt_rows = target.rows((maxcol,), True)
+            tgt_rows = self._rows(target, maxcol, True)
             if offset_inset + tgt_rows <= 0:
                 raise ListBoxError(f"Invalid offset_inset: {offset_inset!r}, only {tgt_rows!r} rows in target!")
             self.offset_rows = 0
@@ -1090,10 +1237,10 @@ class ListBox(Widget, WidgetContainerMixin):
             return
 
         pref_col = None
-        if hasattr(widget, "get_pref_col"):
-            pref_col = widget.get_pref_col((maxcol,))
-        if pref_col is None and hasattr(widget, "get_cursor_coords"):
-            coords = widget.get_cursor_coords((maxcol,))
+        if get_pref_col := getattr(widget, "get_pref_col", None):
+            pref_col = get_pref_col((maxcol,))
+        if pref_col is None and (get_cursor_coords := getattr(widget, "get_cursor_coords", None)):
+            coords = get_cursor_coords((maxcol,))
             if isinstance(coords, tuple):
                 pref_col, _y = coords
         if pref_col is not None:
@@ -1144,7 +1291,7 @@ class ListBox(Widget, WidgetContainerMixin):
         self._invalidate()
         self._body.set_focus(position)
         target, _ignore = self._body.get_focus()
-        tgt_rows = target.rows((maxcol,), True)
+        tgt_rows = self._rows(target, maxcol, True)
         if snap_rows is None:
             snap_rows = maxrow - 1
 
@@ -1183,11 +1330,9 @@ class ListBox(Widget, WidgetContainerMixin):
                 return  # must either know row or coming_from
             cursor_coords = (self.pref_col,)
 
-        if not hasattr(target, "move_cursor_to_coords"):
+        if not (move_cursor_to_coords := getattr(target, "move_cursor_to_coords", None)):
             return
 
-        attempt_rows = []
-
         if len(cursor_coords) == 1:
             # only column (not row) specified
             # start from closest edge and move inwards
@@ -1212,28 +1357,38 @@ class ListBox(Widget, WidgetContainerMixin):
             elif coming_from == "below":
                 attempt_rows = range(pref_row, tgt_rows)
             else:
-                attempt_rows = [pref_row]
+                attempt_rows = (pref_row,)
 
+        # range is lazy: usually the first attempted row is accepted
+        w_size = (maxcol,)
         for row in attempt_rows:
-            if target.move_cursor_to_coords((maxcol,), pref_col, row):
+            if move_cursor_to_coords(w_size, pref_col, row):
                 break
 
+        # cursor move may change focus inside of the target and so it's rows
+        if (rows_cache := self._rows_cache) is not None:
+            rows_cache.discard(target)
+
     def get_focus_offset_inset(self, size: tuple[int, int]) -> tuple[int, int]:
         """Return (offset rows, inset rows) for focus widget."""
         (maxcol, _maxrow) = size
-        focus_widget, _pos = self._body.get_focus()
-        focus_rows = focus_widget.rows((maxcol,), True)
         offset_rows = self.offset_rows
         inset_rows = 0
         if offset_rows == 0:
             inum, iden = self.inset_fraction
             if inum < 0 or iden < 0 or inum >= iden:
                 raise ListBoxError(f"Invalid inset_fraction: {self.inset_fraction!r}")
+            if not inum:  # focus widget is not trimmed: rows are not required
+                return offset_rows, inset_rows
+
+            focus_widget, _pos = self._body.get_focus()
+            focus_rows = self._rows(focus_widget, maxcol, True)
             inset_rows = focus_rows * inum // iden
             if inset_rows and inset_rows >= focus_rows:
                 raise ListBoxError("urwid inset_fraction error (please report)")
         return offset_rows, inset_rows
 
+    @_with_rows_cache
     def make_cursor_visible(self, size: tuple[int, int]) -> None:
         """Shift the focus widget so that its cursor is visible."""
         (maxcol, maxrow) = size
@@ -1243,9 +1398,9 @@ class ListBox(Widget, WidgetContainerMixin):
             return
         if not focus_widget.selectable():
             return
-        if not hasattr(focus_widget, "get_cursor_coords"):
+        if not (get_cursor_coords := getattr(focus_widget, "get_cursor_coords", None)):
             return
-        cursor = focus_widget.get_cursor_coords((maxcol,))
+        cursor = get_cursor_coords((maxcol,))
         if cursor is None:
             return
         _cx, cy = cursor
@@ -1274,8 +1429,6 @@ class ListBox(Widget, WidgetContainerMixin):
          'page up'   move cursor up one listbox length (or widget)
          'page down' move cursor down one listbox length (or widget)
         """
-        from urwid.command_map import Command
-
         (maxcol, maxrow) = size
 
         if self.set_focus_pending or self.set_focus_valign_pending:
@@ -1297,23 +1450,9 @@ class ListBox(Widget, WidgetContainerMixin):
             return None
 
         # pass off the heavy lifting
-        if self._command_map[key] == Command.UP:
-            return actual_key(self._keypress_up((maxcol, maxrow)))
-
-        if self._command_map[key] == Command.DOWN:
-            return actual_key(self._keypress_down((maxcol, maxrow)))
-
-        if self._command_map[key] == Command.PAGE_UP:
-            return actual_key(self._keypress_page_up((maxcol, maxrow)))
-
-        if self._command_map[key] == Command.PAGE_DOWN:
-            return actual_key(self._keypress_page_down((maxcol, maxrow)))
-
-        if self._command_map[key] == Command.MAX_LEFT:
-            return actual_key(self._keypress_max_left((maxcol, maxrow)))
-
-        if self._command_map[key] == Command.MAX_RIGHT:
-            return actual_key(self._keypress_max_right((maxcol, maxrow)))
+        if handler_name := self._command_handlers.get(self._command_map[key]):
+            # resolve by name: handlers may be overridden in subclasses
+            return actual_key(getattr(self, handler_name)((maxcol, maxrow)))
 
         return key
 
@@ -1325,15 +1464,16 @@ class ListBox(Widget, WidgetContainerMixin):
         self.focus_position = next(iter(self.body.positions(reverse=True)))
         self.set_focus_valign(VAlign.BOTTOM)
 
+    @_with_rows_cache
     def _keypress_up(self, size: tuple[int, int]) -> bool | None:
         (maxcol, maxrow) = size
 
-        middle, top, _bottom = self.calculate_visible((maxcol, maxrow), True)
+        middle, top, _bottom = self._calculate_visible_rendered((maxcol, maxrow), True)
         if middle is None:
             return True
 
-        focus_row_offset, focus_widget, focus_pos, _ignore, cursor = middle  # pylint: disable=unpacking-non-sequence
-        _trim_top, fill_above = top  # pylint: disable=unpacking-non-sequence
+        focus_row_offset, focus_widget, focus_pos, _ignore, cursor = middle
+        _trim_top, fill_above = top
 
         row_offset = focus_row_offset
 
@@ -1357,7 +1497,7 @@ class ListBox(Widget, WidgetContainerMixin):
             if widget is None:
                 # cannot scroll any further
                 return True  # keypress not handled
-            rows = widget.rows((maxcol,), True)
+            rows = self._rows(widget, maxcol, True)
             row_offset -= rows
             if rows and widget.selectable():
                 # this one will do
@@ -1384,7 +1524,7 @@ class ListBox(Widget, WidgetContainerMixin):
                     widget, pos = self._body.get_prev(pos)
                     if widget is None:
                         return None  # can't do anything
-                    rows = widget.rows((maxcol,), True)
+                    rows = self._rows(widget, maxcol, True)
                     row_offset -= rows
 
                 if -row_offset >= rows:
@@ -1398,15 +1538,16 @@ class ListBox(Widget, WidgetContainerMixin):
         self.shift_focus((maxcol, maxrow), focus_row_offset + 1)
         return None
 
+    @_with_rows_cache
     def _keypress_down(self, size: tuple[int, int]) -> bool | None:
         (maxcol, maxrow) = size
 
-        middle, _top, bottom = self.calculate_visible((maxcol, maxrow), True)
+        middle, _top, bottom = self._calculate_visible_rendered((maxcol, maxrow), True)
         if middle is None:
             return True
 
-        focus_row_offset, focus_widget, focus_pos, focus_rows, cursor = middle  # pylint: disable=unpacking-non-sequence
-        _trim_bottom, fill_below = bottom  # pylint: disable=unpacking-non-sequence
+        focus_row_offset, focus_widget, focus_pos, focus_rows, cursor = middle
+        _trim_bottom, fill_below = bottom
 
         row_offset = focus_row_offset + focus_rows
         rows = focus_rows
@@ -1431,7 +1572,7 @@ class ListBox(Widget, WidgetContainerMixin):
             if widget is None:
                 # cannot scroll any further
                 return True  # keypress not handled
-            rows = widget.rows((maxcol,))
+            rows = self._rows(widget, maxcol)
             if rows and widget.selectable():
                 # this one will do
                 self.change_focus((maxcol, maxrow), pos, row_offset, "above")
@@ -1477,15 +1618,16 @@ class ListBox(Widget, WidgetContainerMixin):
         self.shift_focus((maxcol, maxrow), focus_row_offset - 1)
         return None
 
+    @_with_rows_cache
     def _keypress_page_up(self, size: tuple[int, int]) -> bool | None:
         (maxcol, maxrow) = size
 
-        middle, top, _bottom = self.calculate_visible((maxcol, maxrow), True)
+        middle, top, _bottom = self._calculate_visible_rendered((maxcol, maxrow), True)
         if middle is None:
             return True
 
-        row_offset, focus_widget, focus_pos, focus_rows, cursor = middle  # pylint: disable=unpacking-non-sequence
-        _trim_top, fill_above = top  # pylint: disable=unpacking-non-sequence
+        row_offset, focus_widget, focus_pos, focus_rows, cursor = middle
+        _trim_top, fill_above = top
 
         # topmost_visible is row_offset rows above top row of
         # focus (+ve) or -row_offset rows below top row of focus (-ve)
@@ -1525,11 +1667,13 @@ class ListBox(Widget, WidgetContainerMixin):
             t.append((row_offset, widget, pos, rows))
         # add newly visible ones, including within snap_rows
         snap_region_start = len(t)
+        get_prev = self._body.get_prev
+        get_rows = self._rows
         while row_offset > -snap_rows:
-            widget, pos = self._body.get_prev(pos)
+            widget, pos = get_prev(pos)
             if widget is None:
                 break
-            rows = widget.rows((maxcol,))
+            rows = get_rows(widget, maxcol)
             row_offset -= rows
             # determine if one below puts current one into snap rgn
             if row_offset > 0:
@@ -1548,15 +1692,13 @@ class ListBox(Widget, WidgetContainerMixin):
             del t[0]
             snap_region_start -= 1
 
-        # we'll need this soon
-        self.update_pref_col_from_focus((maxcol, maxrow))
-
         # choose the topmost selectable and (newly) visible widget
         # search within snap_rows then visible region
         search_order = list(range(snap_region_start, len(t))) + list(range(snap_region_start - 1, -1, -1))
         # assert 0, repr((t, search_order))
-        bad_choices = []
+        bad_choices = set()
         cut_off_selectable_chosen = 0
+        pref_col_updated = False
         for i in search_order:
             row_offset, widget, pos, rows = t[i]
             if not widget.selectable():
@@ -1565,6 +1707,11 @@ class ListBox(Widget, WidgetContainerMixin):
             if not rows:
                 continue
 
+            # we'll need this now: focus is unchanged until the first attempt
+            if not pref_col_updated:
+                self.update_pref_col_from_focus((maxcol, maxrow))
+                pref_col_updated = True
+
             # try selecting this widget
             pref_row = max(0, -row_offset)
 
@@ -1588,10 +1735,6 @@ class ListBox(Widget, WidgetContainerMixin):
                     snap_rows,
                 )
 
-            # if we're as far up as we can scroll, take this one
-            if fill_above and self._body.get_prev(fill_above[-1][1]) == (None, None):
-                pass  # return
-
             # find out where that actually puts us
             middle, top, _bottom = self.calculate_visible((maxcol, maxrow), True)
             act_row_offset, _ign1, _ign2, _ign3, _ign4 = middle  # pylint: disable=unpacking-non-sequence
@@ -1599,15 +1742,15 @@ class ListBox(Widget, WidgetContainerMixin):
             # discard chosen widget if it will reduce scroll amount
             # because of a fixed cursor (absolute last resort)
             if act_row_offset > row_offset + snap_rows:
-                bad_choices.append(i)
+                bad_choices.add(i)
                 continue
             if act_row_offset < row_offset:
-                bad_choices.append(i)
+                bad_choices.add(i)
                 continue
 
             # also discard if off top edge (second last resort)
             if act_row_offset < 0:
-                bad_choices.append(i)
+                bad_choices.add(i)
                 cut_off_selectable_chosen = 1
                 continue
 
@@ -1617,10 +1760,6 @@ class ListBox(Widget, WidgetContainerMixin):
         if cut_off_selectable_chosen:
             return None
 
-        if fill_above and focus_widget.selectable() and self._body.get_prev(fill_above[-1][1]) == (None, None):
-            # if we're at the top and have a selectable, return
-            pass  # return
-
         # if still none found choose the topmost widget
         good_choices = [j for j in search_order if j not in bad_choices]
         for i in good_choices + search_order:
@@ -1640,6 +1779,8 @@ class ListBox(Widget, WidgetContainerMixin):
             return None
 
         # no choices available, just shift current one
+        if not pref_col_updated:
+            self.update_pref_col_from_focus((maxcol, maxrow))
         self.shift_focus((maxcol, maxrow), min(maxrow - 1, row_offset))
 
         # final check for pathological case where we may fall short
@@ -1658,7 +1799,7 @@ class ListBox(Widget, WidgetContainerMixin):
             # no dice, we're stuck here
             return None
         # bring in only one row if possible
-        rows = widget.rows((maxcol,), True)
+        rows = self._rows(widget, maxcol, True)
         self.change_focus(
             (maxcol, maxrow),
             pos,
@@ -1669,15 +1810,16 @@ class ListBox(Widget, WidgetContainerMixin):
         )
         return None
 
+    @_with_rows_cache
     def _keypress_page_down(self, size: tuple[int, int]) -> bool | None:
         (maxcol, maxrow) = size
 
-        middle, _top, bottom = self.calculate_visible((maxcol, maxrow), True)
+        middle, _top, bottom = self._calculate_visible_rendered((maxcol, maxrow), True)
         if middle is None:
             return True
 
-        row_offset, focus_widget, focus_pos, focus_rows, cursor = middle  # pylint: disable=unpacking-non-sequence
-        _trim_bottom, fill_below = bottom  # pylint: disable=unpacking-non-sequence
+        row_offset, focus_widget, focus_pos, focus_rows, cursor = middle
+        _trim_bottom, fill_below = bottom
 
         # bottom_edge is maxrow-focus_pos rows below top row of focus
         bottom_edge = maxrow - row_offset
@@ -1717,11 +1859,13 @@ class ListBox(Widget, WidgetContainerMixin):
             row_offset += rows
         # add newly visible ones, including within snap_rows
         snap_region_start = len(t)
+        get_next = self._body.get_next
+        get_rows = self._rows
         while row_offset < maxrow + snap_rows:
-            widget, pos = self._body.get_next(pos)
+            widget, pos = get_next(pos)
             if widget is None:
                 break
-            rows = widget.rows((maxcol,))
+            rows = get_rows(widget, maxcol)
             t.append((row_offset, widget, pos, rows))
             row_offset += rows
             # determine if one above puts current one into snap rgn
@@ -1740,15 +1884,13 @@ class ListBox(Widget, WidgetContainerMixin):
             del t[0]
             snap_region_start -= 1
 
-        # we'll need this soon
-        self.update_pref_col_from_focus((maxcol, maxrow))
-
         # choose the bottommost selectable and (newly) visible widget
         # search within snap_rows then visible region
         search_order = list(range(snap_region_start, len(t))) + list(range(snap_region_start - 1, -1, -1))
         # assert 0, repr((t, search_order))
-        bad_choices = []
+        bad_choices = set()
         cut_off_selectable_chosen = 0
+        pref_col_updated = False
         for i in search_order:
             row_offset, widget, pos, rows = t[i]
             if not widget.selectable():
@@ -1757,6 +1899,11 @@ class ListBox(Widget, WidgetContainerMixin):
             if not rows:
                 continue
 
+            # we'll need this now: focus is unchanged until the first attempt
+            if not pref_col_updated:
+                self.update_pref_col_from_focus((maxcol, maxrow))
+                pref_col_updated = True
+
             # try selecting this widget
             pref_row = min(maxrow - row_offset - 1, rows - 1)
 
@@ -1787,15 +1934,15 @@ class ListBox(Widget, WidgetContainerMixin):
             # discard chosen widget if it will reduce scroll amount
             # because of a fixed cursor (absolute last resort)
             if act_row_offset < row_offset - snap_rows:
-                bad_choices.append(i)
+                bad_choices.add(i)
                 continue
             if act_row_offset > row_offset:
-                bad_choices.append(i)
+                bad_choices.add(i)
                 continue
 
             # also discard if off top edge (second last resort)
             if act_row_offset + rows > maxrow:
-                bad_choices.append(i)
+                bad_choices.add(i)
                 cut_off_selectable_chosen = 1
                 continue
 
@@ -1824,6 +1971,8 @@ class ListBox(Widget, WidgetContainerMixin):
             return None
 
         # no choices available, just shift current one
+        if not pref_col_updated:
+            self.update_pref_col_from_focus((maxcol, maxrow))
         self.shift_focus((maxcol, maxrow), max(1 - focus_rows, row_offset))
 
         # final check for pathological case where we may fall short
@@ -1842,7 +1991,7 @@ class ListBox(Widget, WidgetContainerMixin):
             # no dice, we're stuck here
             return None
         # bring in only one row if possible
-        rows = widget.rows((maxcol,), True)
+        rows = self._rows(widget, maxcol, True)
         self.change_focus(
             (maxcol, maxrow),
             pos,
@@ -1869,16 +2018,16 @@ class ListBox(Widget, WidgetContainerMixin):
         from urwid.util import is_mouse_press
 
         (maxcol, maxrow) = size
-        middle, top, bottom = self.calculate_visible((maxcol, maxrow), focus=True)
+        middle, top, bottom = self._calculate_visible_rendered((maxcol, maxrow), focus=True)
         if middle is None:
             return False
 
-        _ignore, focus_widget, focus_pos, focus_rows, _cursor = middle  # pylint: disable=unpacking-non-sequence
-        trim_top, fill_above = top  # pylint: disable=unpacking-non-sequence
-        _ignore, fill_below = bottom  # pylint: disable=unpacking-non-sequence
+        _ignore, focus_widget, focus_pos, focus_rows, _cursor = middle
+        trim_top, fill_above = top
+        _ignore, fill_below = bottom
 
-        fill_above.reverse()  # fill_above is in bottom-up order
-        w_list = [*fill_above, (focus_widget, focus_pos, focus_rows), *fill_below]
+        # fill_above is in bottom-up order and may be shared with the render cache: do not modify it
+        w_list = [*reversed(fill_above), (focus_widget, focus_pos, focus_rows), *fill_below]
 
         wrow = -trim_top
         for w, w_pos, w_rows in w_list:  # noqa: B007  # magic with scope
@@ -1924,14 +2073,14 @@ class ListBox(Widget, WidgetContainerMixin):
         """
         (maxcol, maxrow) = size
         result = []
-        middle, top, bottom = self.calculate_visible((maxcol, maxrow), focus=focus)
+        middle, top, bottom = self._calculate_visible_rendered((maxcol, maxrow), focus=focus)
         if middle is None:  # empty listbox
             return ["top", "bottom"]
-        trim_top, above = top  # pylint: disable=unpacking-non-sequence
-        trim_bottom, below = bottom  # pylint: disable=unpacking-non-sequence
+        trim_top, above = top
+        trim_bottom, below = bottom
 
         if trim_bottom == 0:
-            row_offset, _w, pos, rows, _c = middle  # pylint: disable=unpacking-non-sequence
+            row_offset, _w, pos, rows, _c = middle
             row_offset += rows
             for _w, pos, rows in below:  # noqa: B007  # magic with scope
                 row_offset += rows
@@ -1939,7 +2088,7 @@ class ListBox(Widget, WidgetContainerMixin):
                 result.append("bottom")
 
         if trim_top == 0:
-            row_offset, _w, pos, _rows, _c = middle  # pylint: disable=unpacking-non-sequence
+            row_offset, _w, pos, _rows, _c = middle
             for _w, pos, rows in above:  # noqa: B007  # magic with scope
                 row_offset -= rows
             if self._body.get_prev(pos) == (None, None):
@@ -1947,7 +2096,7 @@ class ListBox(Widget, WidgetContainerMixin):
 
         return result
 
-    def __iter__(self):
+    def __iter__(self) -> Iterator[typing.Any]:
         """
         Return an iterator over the positions in this ListBox.
 
@@ -1958,26 +2107,32 @@ class ListBox(Widget, WidgetContainerMixin):
         """
 
         if positions_fn := getattr(self._body, "positions", None):
-            yield from positions_fn()
-            return
+            # iterate positions directly, without extra generator frame per item
+            return iter(positions_fn())
 
-        focus_widget, focus_pos = self._body.get_focus()
+        return self._iter_walk()
+
+    def _iter_walk(self) -> Iterator[typing.Any]:
+        body = self._body
+        focus_widget, focus_pos = body.get_focus()
         if focus_widget is None:
             return
+        get_next = body.get_next
+        get_prev = body.get_prev
         pos = focus_pos
         while True:
             yield pos
-            w, pos = self._body.get_next(pos)
+            w, pos = get_next(pos)
             if not w:
                 break
         pos = focus_pos
         while True:
-            w, pos = self._body.get_prev(pos)
+            w, pos = get_prev(pos)
             if not w:
                 break
             yield pos
 
-    def __reversed__(self):
+    def __reversed__(self) -> Iterator[typing.Any]:
         """
         Return a reversed iterator over the positions in this ListBox.
 
@@ -1989,21 +2144,26 @@ class ListBox(Widget, WidgetContainerMixin):
         """
 
         if positions_fn := getattr(self._body, "positions", None):
-            yield from positions_fn(reverse=True)
-            return
+            return iter(positions_fn(reverse=True))
 
-        focus_widget, focus_pos = self._body.get_focus()
+        return self._reversed_walk()
+
+    def _reversed_walk(self) -> Iterator[typing.Any]:
+        body = self._body
+        focus_widget, focus_pos = body.get_focus()
         if focus_widget is None:
             return
+        get_next = body.get_next
+        get_prev = body.get_prev
         pos = focus_pos
         while True:
-            w, pos = self._body.get_prev(pos)
+            w, pos = get_prev(pos)
             if not w:
                 break
             yield pos
         pos = focus_pos
         while True:
             yield pos
-            w, pos = self._body.get_next(pos)
+            w, pos = get_next(pos)
             if not w:
                 break